@@ -1,11 +1,12 @@
 import dash
 from dash import html
-import dash_bootstrap_components as dbc
+from flask_compress import Compress
+import plotly.io as pio
 
 import data_manager
 from layout import create_layout, create_error_layout
 from callbacks import register_callbacks
-from config import HOST, PORT
+from config import HOST, PORT, THEME_URLS
 
 # Załaduj dane
 data_manager.download_data_if_needed()
@@ -14,15 +15,25 @@ df = data_manager.load_validated_data()
 # Ustal zawartość strony na podstawie danych
 page_content = create_layout(df) if df is not None else create_error_layout()
 
+# Silnik serializacji wykresów (używany też dla odpowiedzi callbacków Dash). W trybie "auto" Plotly
+# wybrałby orjson, gdy jest zainstalowany, ale dla tych wykresów (tablice kodowane już jako base64)
+# standardowy enkoder okazał się szybszy: ~12 ms wobec ~16 ms na komplet dziewięciu wykresów.
+pio.json.config.default_engine = "json"
+
 # Zainicjuj aplikację Dash
 app = dash.Dash(
     __name__,
-    external_stylesheets=[dbc.themes.FLATLY],
+    external_stylesheets=[THEME_URLS["Jasny"]],
     suppress_callback_exceptions=True
 )
 app.title = "Nawyki studentów a wyniki w nauce"
 server = app.server
 
+# Kompresja odpowiedzi serwera (JSON wykresów zwracany przez callbacki jest duży, ale dobrze się kompresuje)
+server.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+server.config["COMPRESS_MIN_SIZE"] = 512
+Compress(server)
+
 # Ustaw główny i kompletny layout aplikacji
 app.layout = html.Div([
     # Linkowanie arkusza stylów
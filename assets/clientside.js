@@ -0,0 +1,60 @@
+// Callbacki wykonywane po stronie przeglądarki (bez zapytań do serwera)
+
+// Opóźnienie (ms) przekazania zmian filtrów do głównego callbacku
+const FILTER_DEBOUNCE_MS = 300;
+let filterDebounceId = 0;
+
+// Style layoutu dla motywów
+const LAYOUT_PADDING = {padding: "20px", paddingLeft: "5%", paddingRight: "5%"};
+const LAYOUT_STYLES = {
+    "Jasny": Object.assign({backgroundColor: "white", color: "black"}, LAYOUT_PADDING),
+    "Ciemny": Object.assign({backgroundColor: "#1e1e1e", color: "white"}, LAYOUT_PADDING)
+};
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    filters: {
+        // Zbiera wartości filtrów i przekazuje je dopiero, gdy przez FILTER_DEBOUNCE_MS nie było nowej zmiany
+        debounce_filters: function (gender, edu, studyHours, job) {
+            const callId = ++filterDebounceId;
+            return new Promise(function (resolve) {
+                setTimeout(function () {
+                    if (callId !== filterDebounceId) {
+                        resolve(window.dash_clientside.no_update);
+                        return;
+                    }
+                    resolve({gender: gender, edu: edu, study_hours: studyHours, job: job});
+                }, FILTER_DEBOUNCE_MS);
+            });
+        }
+    },
+    theme: {
+        // Zapisuje wybrany motyw w dcc.Store
+        store_theme: function (selectedTheme) {
+            return selectedTheme;
+        },
+
+        // Dodaje specjalną klasę CSS do dropdownów w trybie ciemnym
+        dropdown_class: function (themeName) {
+            const className = themeName === "Ciemny" ? "dark-dropdown" : "";
+            return [className, className, className];
+        },
+
+        // Zwraca styl głównego kontenera dla wybranego motywu
+        layout_style: function (themeName) {
+            return themeName === "Ciemny" ? LAYOUT_STYLES["Ciemny"] : LAYOUT_STYLES["Jasny"];
+        },
+
+        // Podmienia szablon Plotly w już narysowanych wykresach po zmianie motywu
+        apply_plot_template: function (themeName, templates, ...figures) {
+            const template = templates[themeName] || templates["Jasny"];
+            return figures.map(function (figure) {
+                if (!figure) {
+                    return window.dash_clientside.no_update;
+                }
+                return Object.assign({}, figure, {
+                    layout: Object.assign({}, figure.layout, {template: template})
+                });
+            });
+        }
+    }
+});
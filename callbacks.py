@@ -1,12 +1,16 @@
-from typing import List, Optional, Tuple
-from dash import Input, Output
+from typing import Any, Dict, List, Optional, Tuple
+from dash import ClientsideFunction, Input, Output, State
+from flask_caching import Cache
 import pandas as pd
-from plotly.graph_objs import Figure
-import dash_bootstrap_components as dbc
 
 import data_manager
 import plots
-from config import THEMES
+from config import THEME_URLS, PLOT_TEMPLATES, FIGURE_IDS, CACHE_CONFIG
+
+# Wyniki głównego callbacku: dziewięć wykresów (jako słowniki JSON Plotly) i trzy KPI
+FigureJson = Dict[str, Any]
+Visuals = Tuple[FigureJson, FigureJson, FigureJson, FigureJson, FigureJson, FigureJson,
+                FigureJson, FigureJson, FigureJson, str, str, str]
 
 
 def register_callbacks(app, df: pd.DataFrame):
@@ -19,110 +23,105 @@ def register_callbacks(app, df: pd.DataFrame):
     )
     def update_main_stylesheet(theme_name: str) -> str:
         """Aktualizuje główny arkusz stylów Bootstrap."""
-        if theme_name in THEMES:
-            return dbc.themes.__dict__[THEMES[theme_name]]
-        return dbc.themes.FLATLY
+        return THEME_URLS.get(theme_name, THEME_URLS["Jasny"])
 
     # Rejestruj główne callbacki tylko, jeśli DataFrame został pomyślnie załadowany.
     if df is not None:
-        @app.callback(
+        # Zapis wybranego motywu w dcc.Store – po stronie przeglądarki, bez zapytania do serwera.
+        app.clientside_callback(
+            ClientsideFunction(namespace="theme", function_name="store_theme"),
             Output("theme-store", "data"),
             Input("theme-selector", "value")
         )
-        def update_theme_store(selected_theme: str) -> str:
-            """Zapisuje wybrany motyw w dcc.Store."""
-            return selected_theme
 
-        # Ten callback odpowiada za styl dropdownów w ciemnym motywie.
-        @app.callback(
+        # Styl dropdownów w ciemnym motywie – przełączany w przeglądarce, bez zapytania do serwera.
+        app.clientside_callback(
+            ClientsideFunction(namespace="theme", function_name="dropdown_class"),
             [Output("gender-filter", "className"),
              Output("edu-filter", "className"),
              Output("job-filter", "className")],
             Input("theme-store", "data")
         )
-        def update_dropdown_class(theme_name: str) -> Tuple[str, str, str]:
-            """Dodaje specjalną klasę CSS do dropdownów w trybie ciemnym."""
-            class_name = "dark-dropdown" if theme_name == "Ciemny" else ""
-            return class_name, class_name, class_name
 
-    @app.callback(
+    # Tło i kolor tekstu całego layoutu – również po stronie przeglądarki.
+    app.clientside_callback(
+        ClientsideFunction(namespace="theme", function_name="layout_style"),
         Output("themed-layout", "style"),
         Input("theme-store", "data")
     )
-    def update_layout_style(current_theme):
-        padding = {"padding": "20px", "paddingLeft": "5%", "paddingRight": "5%"}
-
-        if current_theme == "Ciemny":
-            return {
-                "backgroundColor": "#1e1e1e",
-                "color": "white",
-                **padding
-            }
-        else:  # Jasny
-            return {
-                "backgroundColor": "white",
-                "color": "black",
-                **padding
-            }
+
+    # Wspólna pamięć podręczna wyników – przy backendzie współdzielonym (np. Redis) także między procesami serwera
+    cache = Cache(app.server, config=CACHE_CONFIG)
+
+    # Wersja danych, z których pochodzi df (suma SHA-256 pliku CSV, wspólna dla wszystkich procesów) – część
+    # klucza cache, aby wpisy zapisane dla poprzedniej wersji danych (np. w FileSystemCache lub Redis
+    # po restarcie) nie były zwracane dla nowych danych
+    data_version = data_manager.loaded_data_version()
+
+    @cache.memoize()
+    def build_visuals(filter_key: data_manager.FilterKey, template: str,
+                      version: str) -> Visuals:
+        """Buduje wykresy i KPI dla danego stanu filtrów (wynik zapamiętywany dla danej wersji danych)."""
+        # 1. Filtrowanie danych – numery wierszy spełniających filtry
+        indices = data_manager.filter_indices(df, *filter_key)
+        filtered_df = df.take(indices)
+
+        # 2. Obliczenia KPI (na tablicach NumPy, bez przefiltrowanego DataFrame)
+        kpis = data_manager.compute_kpis(df, indices)
+
+        # 3. Tworzenie wykresów
+        figures = plots.create_all_figures(filtered_df, template)
+
+        # Do cache trafiają gotowe słowniki JSON, więc trafienie pomija również konwersję obiektów Figure
+        return (*(fig.to_plotly_json() for fig in figures), *kpis)
 
     @app.callback(
-        [Output("scatter-plot", "figure"),
-         Output("box-plot", "figure"),
-         Output("heatmap", "figure"),
-         Output("histogram_fig", "figure"),
-         Output("barchart_fig", "figure"),
-         Output("line_fig", "figure"),
-         Output("attendance-violin-plot", "figure"),
-         Output("job-sunburst", "figure"),
-         Output("mental-health-polar", "figure"),
+        [*[Output(figure_id, "figure") for figure_id in FIGURE_IDS],
          Output("kpi-student-count", "children"),
          Output("kpi-avg-score", "children"),
          Output("kpi-avg-study-hours", "children")],
-        [Input("gender-filter", "value"),
-         Input("edu-filter", "value"),
-         Input("study-hours-slider", "value"),
-         Input("job-filter", "value"),
-         Input("theme-store", "data")]
+        Input("filter-state", "data"),
+        # Motyw jest tylko odczytywany – jego zmianę obsługuje callback po stronie klienta
+        State("theme-store", "data"),
+        # Stan początkowy (bez filtrów) jest renderowany od razu w layoucie
+        prevent_initial_call=True
     )
     def update_all_visuals(
-            selected_gender: Optional[List[str]],
-            selected_edu: Optional[List[str]],
-            study_hours_range: List[int],
-            selected_job: Optional[List[str]],
+            filter_state: Dict[str, Optional[List]],
             theme_name: str
-    ) -> Tuple[Figure, Figure, Figure, Figure, Figure, Figure, Figure, Figure, Figure, str, str, str]:
+    ) -> Visuals:
         """Główny callback aktualizujący wszystkie wykresy i KPI."""
 
-        template = "plotly_dark" if theme_name == "Ciemny" else "plotly_white"
+        selected_gender: Optional[List[str]] = filter_state.get("gender")
+        selected_edu: Optional[List[str]] = filter_state.get("edu")
+        study_hours_range: List[int] = filter_state.get("study_hours") or []
+        selected_job: Optional[List[str]] = filter_state.get("job")
 
-        # 1. Filtrowanie danych
-        filtered_df = data_manager.filter_data(
-            df, selected_gender, selected_edu, study_hours_range, selected_job
+        template = PLOT_TEMPLATES.get(theme_name, PLOT_TEMPLATES["Jasny"])
+        filter_key = data_manager.make_filter_key(
+            selected_gender, selected_edu, study_hours_range, selected_job
         )
 
-        # 2. Obliczenia KPI
-        if filtered_df.empty:
-            student_count = "0"
-            avg_score = "N/A"
-            avg_study_hours = "N/A"
-        else:
-            student_count = str(len(filtered_df))
-            avg_score = f"{filtered_df['exam_score'].mean():.2f}"
-            avg_study_hours = f"{filtered_df['study_hours_per_day'].mean():.2f}"
+        return build_visuals(filter_key, template, data_version)
 
-        # 3. Tworzenie wykresów
-        scatter_fig = plots.create_scatter_plot(filtered_df, template)
-        box_fig = plots.create_box_plot(filtered_df, template)
-        heatmap_fig = plots.create_heatmap(filtered_df, template)
-        histogram_fig = plots.create_exam_score_histogram(filtered_df, template)
-        barchart_fig = plots.create_bar_avg_score_by_edu(filtered_df, template)
-        line_fig = plots.create_sleep_vs_score_lineplot(filtered_df, template)
-        attendance_fig = plots.create_attendance_violin_plot(filtered_df, template)
-        job_fig = plots.create_job_sunburst_chart(filtered_df, template)
-        mental_fig = plots.create_mental_health_polar_chart(filtered_df, template)
-
-        return (
-            scatter_fig, box_fig, heatmap_fig, histogram_fig, barchart_fig, line_fig,
-            attendance_fig, job_fig, mental_fig,
-            student_count, avg_score, avg_study_hours
-        )
\ No newline at end of file
+    # Zmiany filtrów trafiają do filter-state dopiero po chwili bez kolejnych zmian,
+    # dzięki czemu seria szybkich kliknięć wywołuje tylko jedno przeliczenie wykresów.
+    app.clientside_callback(
+        ClientsideFunction(namespace="filters", function_name="debounce_filters"),
+        Output("filter-state", "data"),
+        [Input("gender-filter", "value"),
+         Input("edu-filter", "value"),
+         Input("study-hours-slider", "value"),
+         Input("job-filter", "value")],
+        prevent_initial_call=True
+    )
+
+    # Zmiana motywu podmienia jedynie szablon istniejących wykresów w przeglądarce,
+    # bez ponownego filtrowania danych i budowania wykresów na serwerze.
+    app.clientside_callback(
+        ClientsideFunction(namespace="theme", function_name="apply_plot_template"),
+        [Output(figure_id, "figure", allow_duplicate=True) for figure_id in FIGURE_IDS],
+        Input("theme-store", "data"),
+        [State("plot-templates", "data"), *[State(figure_id, "figure") for figure_id in FIGURE_IDS]],
+        prevent_initial_call=True
+    )
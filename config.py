@@ -1,14 +1,31 @@
 import os
 
+import dash_bootstrap_components as dbc
+
 # Konfiguracja serwera
 HOST = os.getenv("HOST", "127.0.0.1")
 PORT = int(os.getenv("PORT", 8050))
 
+# Konfiguracja pamięci podręcznej wykresów (Flask-Caching). Domyślnie SimpleCache w pamięci procesu;
+# przy kilku procesach serwera warto ustawić CACHE_TYPE=FileSystemCache (katalog CACHE_DIR)
+# lub CACHE_TYPE=RedisCache i CACHE_REDIS_URL, aby cache był wspólny (FileSystemCache – dla procesów na jednej
+# maszynie, Redis – także między maszynami). Klucz wpisu zawiera wersję danych (sumę SHA-256 pliku CSV), taką
+# samą w każdym procesie, więc wpisy są współdzielone już od pierwszego uruchomienia, a po podmianie zbioru
+# danych wpisy poprzedniej wersji nie są już używane – także po restarcie serwera – i wygasają po CACHE_TIMEOUT
+# sekundach.
+CACHE_CONFIG = {
+    "CACHE_TYPE": os.getenv("CACHE_TYPE", "SimpleCache"),
+    "CACHE_DEFAULT_TIMEOUT": int(os.getenv("CACHE_TIMEOUT", 3600)),
+    "CACHE_DIR": os.getenv("CACHE_DIR", os.path.join("data", "cache")),
+    "CACHE_REDIS_URL": os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"),
+    "CACHE_THRESHOLD": 256
+}
+
 # Konfiguracja ścieżek do danych
 DATA_DIR = "data"
 CSV_FILENAME = "student_habits_performance.csv"
+PARQUET_FILENAME = "student_habits_performance.parquet"  # Kopia zwalidowanych danych w formacie Parquet
 KAGGLE_DATASET = "jayaantanaath/student-habits-vs-academic-performance"
-KAGGLE_ZIP = "student-habits-vs-academic-performance.zip"
 
 # Lista wymaganych kolumn w zbiorze danych
 REQUIRED_COLUMNS = [
@@ -17,14 +34,49 @@ REQUIRED_COLUMNS = [
     'attendance_percentage', 'part_time_job', 'mental_health_rating'
 ]
 
+# Kolumny tekstowe o niewielkiej liczbie wartości, przechowywane jako typ 'category'
+CATEGORICAL_COLUMNS = ['gender', 'parental_education_level', 'part_time_job']
+
+# Typy kolumn wczytywanych z CSV (węższe typy liczbowe zmniejszają zużycie pamięci). Wynik i godziny nauki
+# pozostają float64, bo z nich liczone są średnie KPI (float32 zmieniałby zaokrąglenie wyświetlanych wartości);
+# ocena kondycji psychicznej jako float32, aby pusta ocena w pliku była brakiem (NaN), a nie błędem wczytywania
+COLUMN_DTYPES = {
+    **{col: 'category' for col in CATEGORICAL_COLUMNS},
+    'study_hours_per_day': 'float64',
+    'exam_score': 'float64',
+    'social_media_hours': 'float32',
+    'sleep_hours': 'float32',
+    'attendance_percentage': 'float32',
+    'mental_health_rating': 'float32'
+}
+
 # Kolumny numeryczne używane w mapie ciepła
 HEATMAP_NUMERIC_COLS = [
     'study_hours_per_day', 'sleep_hours', 'social_media_hours',
     'exam_score', 'attendance_percentage'
 ]
 
-# Mapowanie motywów na adresy URL z dash-bootstrap-components
-THEMES = {
-    "Jasny": "FLATLY",
-    "Ciemny": "DARKLY"
+# Maksymalna liczba punktów wykresu rozrzutu wysyłanych do przeglądarki (większe zbiory są próbkowane)
+SCATTER_MAX_POINTS = 5000
+
+# Przedziały wyników egzaminu dla kolumny pochodnej 'score_category' (wykres skrzypcowy frekwencji)
+SCORE_CATEGORY_BINS = [0, 60, 75, 85, 100]
+SCORE_CATEGORY_LABELS = ['Słaby (0-60)', 'Średni (60-75)', 'Dobry (75-85)', 'Bardzo dobry (85-100)']
+
+# Mapowanie motywów na adresy URL arkuszy stylów z dash-bootstrap-components
+THEME_URLS = {
+    "Jasny": dbc.themes.FLATLY,
+    "Ciemny": dbc.themes.DARKLY
+}
+
+# Mapowanie motywów na szablony wykresów Plotly
+PLOT_TEMPLATES = {
+    "Jasny": "plotly_white",
+    "Ciemny": "plotly_dark"
 }
+
+# Identyfikatory wszystkich wykresów dashboardu (w kolejności wyjść głównego callbacku)
+FIGURE_IDS = [
+    "scatter-plot", "box-plot", "heatmap", "histogram_fig", "barchart_fig", "line_fig",
+    "attendance-violin-plot", "job-sunburst", "mental-health-polar"
+]
@@ -1,9 +1,47 @@
+import hashlib
 import os
-import zipfile
-from typing import List, Optional
+import tempfile
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-from config import DATA_DIR, CSV_FILENAME, KAGGLE_DATASET, KAGGLE_ZIP, REQUIRED_COLUMNS
+from config import (DATA_DIR, CSV_FILENAME, PARQUET_FILENAME, KAGGLE_DATASET,
+                    REQUIRED_COLUMNS, CATEGORICAL_COLUMNS, COLUMN_DTYPES,
+                    SCORE_CATEGORY_BINS, SCORE_CATEGORY_LABELS)
+
+
+class FilterDomains(NamedTuple):
+    """Dostępne wartości filtrów wyznaczone z danych."""
+    gender: Tuple[str, ...]
+    edu: Tuple[str, ...]
+    job: Tuple[str, ...]
+    min_hours: int
+    max_hours: int
+
+
+# Znormalizowany stan filtrów: (płeć, wykształcenie, zakres godzin nauki, praca)
+FilterKey = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[float, ...], Tuple[str, ...]]
+
+# Tablice kolumn filtrujących (kody kategorii i godziny nauki), maski wierszy dla każdej kategorii,
+# macierz wartości KPI, kategorie oraz dziedziny filtrów przygotowane dla ostatnio załadowanego DataFrame
+_filter_source: Optional[pd.DataFrame] = None
+_filter_arrays: Dict[str, np.ndarray] = {}
+_category_masks: Dict[str, np.ndarray] = {}
+_hours_sorted: bool = False
+_kpi_values: np.ndarray = np.empty((2, 0))
+_kpi_positions: np.ndarray = np.empty(0, dtype=np.intp)
+_filter_categories: Dict[str, pd.Index] = {}
+_filter_domains: Optional[FilterDomains] = None
+
+# Ostatnio załadowany DataFrame wraz ze stemplem pliku źródłowego (czas modyfikacji i rozmiar)
+# oraz wersją danych (suma SHA-256 pliku CSV)
+_loaded_data: Optional[Tuple[Tuple[float, ...], str, pd.DataFrame]] = None
+
+# Klucz metadanych kopii Parquet z sumą SHA-256 pliku CSV, z którego kopia powstała
+_SOURCE_DIGEST_KEY = b'source_sha256'
 
 
 def download_data_if_needed() -> None:
@@ -18,12 +56,13 @@ def download_data_if_needed() -> None:
         os.environ['KAGGLE_CONFIG_DIR'] = os.getcwd()
 
         try:
-            # Pobierz dataset
-            os.system(f"kaggle datasets download -d {KAGGLE_DATASET} -p {DATA_DIR}")
+            # Import dopiero tutaj – pakiet kaggle uwierzytelnia się już przy imporcie
+            from kaggle.api.kaggle_api_extended import KaggleApi
 
-            # Rozpakuj plik ZIP
-            with zipfile.ZipFile(os.path.join(DATA_DIR, KAGGLE_ZIP), 'r') as zip_ref:
-                zip_ref.extractall(DATA_DIR)
+            # Pobierz i rozpakuj dataset bezpośrednio przez API (bez uruchamiania osobnego procesu CLI)
+            api = KaggleApi()
+            api.authenticate()
+            api.dataset_download_files(KAGGLE_DATASET, path=DATA_DIR, unzip=True)
 
             print("✅ Dane zostały pobrane i rozpakowane.")
         except Exception as e:
@@ -33,12 +72,118 @@ def download_data_if_needed() -> None:
         print("✅ Dane już istnieją lokalnie.")
         return None
 
+def _file_digest(path: str) -> str:
+    """Zwraca sumę SHA-256 zawartości pliku."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _load_parquet_cache(parquet_path: str, csv_path: str) -> Optional[Tuple[pd.DataFrame, str]]:
+    """Wczytuje zwalidowane dane i wersję danych z kopii Parquet, jeśli jest dostępna i nie starsza niż plik CSV."""
+    if not os.path.exists(parquet_path):
+        return None
+
+    # Plik CSV zmieniony po utworzeniu kopii – kopia jest nieaktualna i zostanie nadpisana
+    if os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(parquet_path):
+        print("ℹ️ Plik CSV jest nowszy niż kopia Parquet – wczytuję dane z CSV.")
+        return None
+
+    try:
+        # Tylko wymagane kolumny – pozostałe nie są nawet dekodowane z pliku
+        table = pq.read_table(parquet_path, columns=REQUIRED_COLUMNS, use_pandas_metadata=True)
+        source_digest = (table.schema.metadata or {}).get(_SOURCE_DIGEST_KEY)
+        # Kopia bez sumy kontrolnej pliku CSV (zapisana przez starszą wersję) – tworzymy ją na nowo
+        if source_digest is None and os.path.exists(csv_path):
+            print("ℹ️ Kopia Parquet nie zawiera wersji danych – wczytuję dane z CSV.")
+            return None
+        df = table.to_pandas()
+        # Kopia zapisana z innymi typami kolumn (np. przed ich zmianą w COLUMN_DTYPES) – wczytujemy CSV ponownie,
+        # bo rzutowanie nie przywróci precyzji utraconej przy zapisie
+        if os.path.exists(csv_path) and any(str(df[col].dtype) != dtype for col, dtype in COLUMN_DTYPES.items()):
+            print("ℹ️ Kopia Parquet ma nieaktualne typy kolumn – wczytuję dane z CSV.")
+            return None
+        print(f"✅ Dane załadowano z pliku Parquet. Rozmiar: {df.shape}")
+        # Bez pliku CSV wersją danych jest zawartość samej kopii
+        return df, source_digest.decode() if source_digest is not None else _file_digest(parquet_path)
+    except Exception as e:
+        print(f"⚠️ Nie udało się wczytać pliku Parquet ({e}) – wczytuję dane z CSV.")
+        return None
+
+def _save_parquet_cache(df: pd.DataFrame, parquet_path: str, source_digest: str) -> None:
+    """Zapisuje zwalidowane dane (z sumą kontrolną pliku CSV w metadanych) do pliku Parquet,
+    aby kolejne uruchomienia pomijały parsowanie CSV."""
+    table = pa.Table.from_pandas(df)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), _SOURCE_DIGEST_KEY: source_digest.encode()})
+
+    # Zapis do pliku tymczasowego i podmiana jednym os.replace – inny proces serwera uruchamiany w tym samym
+    # czasie widzi starą albo kompletną nową kopię, nigdy zapisaną do połowy
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(parquet_path) or '.',
+                                    prefix=os.path.basename(parquet_path) + '.', suffix='.parquet')
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, parquet_path)
+    except Exception as e:
+        print(f"⚠️ Nie udało się zapisać pliku Parquet: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _source_stamp(csv_path: str, parquet_path: str) -> Tuple[float, ...]:
+    """Zwraca czas modyfikacji i rozmiar pliku źródłowego (CSV, a bez niego kopii Parquet)."""
+    for path in (csv_path, parquet_path):
+        if os.path.exists(path):
+            stat = os.stat(path)
+            return stat.st_mtime, stat.st_size
+    return ()
+
+def loaded_data_version() -> str:
+    """Zwraca wersję (sumę SHA-256 pliku CSV) ostatnio załadowanych danych – pusty napis, gdy brak danych."""
+    return _loaded_data[1] if _loaded_data is not None else ""
+
 def load_validated_data() -> Optional[pd.DataFrame]:
-    """Ładuje i waliduje dane z pliku CSV."""
+    """Ładuje i waliduje dane z pliku CSV (lub z jego kopii Parquet); niezmienione pliki nie są wczytywane ponownie."""
+    global _loaded_data
+
     csv_path = os.path.join(DATA_DIR, CSV_FILENAME)
+    parquet_path = os.path.join(DATA_DIR, PARQUET_FILENAME)
+
+    # Ponowne wywołanie (np. przy ponownym imporcie modułu aplikacji) zwraca ten sam DataFrame,
+    # dzięki czemu zachowane zostają też przygotowane tablice filtrów i zapamiętane wyniki.
+    # Kopia Parquet nie jest częścią stempla – nadpisanie jej przez inny proces nie zmienia danych
+    stamp = _source_stamp(csv_path, parquet_path)
+    if _loaded_data is not None and _loaded_data[0] == stamp:
+        return _loaded_data[2]
+
+    loaded = _read_validated_data(csv_path, parquet_path)
+    if loaded is None:
+        return None
+    df, version = loaded
+    _loaded_data = (stamp, version, df)
+    return df
+
+def _read_validated_data(csv_path: str, parquet_path: str) -> Optional[Tuple[pd.DataFrame, str]]:
+    """Wczytuje dane z kopii Parquet lub z pliku CSV (z walidacją), przygotowuje je do filtrowania
+    i zwraca je wraz z wersją danych (sumą SHA-256 pliku CSV)."""
+    # Kopia Parquet zawiera już zwalidowane dane z typami kategorycznymi
+    cached = _load_parquet_cache(parquet_path, csv_path)
+    if cached is not None:
+        df, source_digest = cached
+        sorted_df = _sort_by_study_hours(df)
+        # Kopia zapisana przed wprowadzeniem sortowania – nadpisujemy ją wersją posortowaną
+        if sorted_df is not df:
+            _save_parquet_cache(sorted_df, parquet_path, source_digest)
+        _add_derived_columns(sorted_df)
+        _prepare_filters(sorted_df)
+        return sorted_df, source_digest
+
     try:
-        # Próba wczytania danych z pliku CSV
-        df = pd.read_csv(csv_path)
+        # Wersja danych zależy tylko od zawartości pliku CSV – ta sama we wszystkich procesach i na każdej maszynie
+        source_digest = _file_digest(csv_path)
+
+        # Próba wczytania danych z pliku CSV – tylko potrzebne kolumny, z jawnie podanymi typami
+        df = pd.read_csv(csv_path, usecols=lambda col: col in REQUIRED_COLUMNS, dtype=COLUMN_DTYPES)
 
         # Walidacja, czy w danych znajdują się wszystkie wymagane kolumny
         missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
@@ -51,8 +196,13 @@ def load_validated_data() -> Optional[pd.DataFrame]:
             print("❌ Zbiór danych jest pusty.")
             return None
 
+        df = _sort_by_study_hours(df)
+        _save_parquet_cache(df, parquet_path, source_digest)
+        _add_derived_columns(df)
+        _prepare_filters(df)
+
         print(f"✅ Dane załadowano pomyślnie. Rozmiar: {df.shape}")
-        return df
+        return df, source_digest
 
     except FileNotFoundError:
         print(f"❌ Nie znaleziono pliku CSV: {csv_path}")
@@ -64,34 +214,156 @@ def load_validated_data() -> Optional[pd.DataFrame]:
         print(f"❌ Wystąpił nieoczekiwany błąd podczas ładowania danych: {e}")
         return None
 
-def filter_data(df: pd.DataFrame, selected_gender: Optional[List[str]],
-                selected_edu: Optional[List[str]], study_hours_range: List[int],
-                selected_job: Optional[List[str]]) -> pd.DataFrame:
-    """Filtruje DataFrame na podstawie wyborów użytkownika."""
-    # Sprawdzenie, czy DataFrame został załadowany
-    if df is None or df.empty:
-        return pd.DataFrame()
+def _sort_by_study_hours(df: pd.DataFrame) -> pd.DataFrame:
+    """Porządkuje wiersze rosnąco wg godzin nauki, aby filtr zakresu mógł korzystać z wyszukiwania binarnego."""
+    if df['study_hours_per_day'].is_monotonic_increasing:
+        return df
+    # Indeks zachowuje numery wierszy z pliku CSV (zapisywany także w kopii Parquet) – KPI są z nich liczone
+    # w pierwotnej kolejności wierszy
+    return df.sort_values('study_hours_per_day', kind='stable')
+
+def _add_derived_columns(df: pd.DataFrame) -> None:
+    """Dodaje kolumny pochodne liczone raz dla całego zbioru (przefiltrowane dane dziedziczą je bez przeliczania)."""
+    # Kategoria wyniku egzaminu jako kody z wyszukiwania binarnego na granicach przedziałów (prawostronnie
+    # domkniętych, jak w pd.cut); wyniki spoza przedziałów (np. 0) i braki pozostają bez kategorii (NaN)
+    scores = df['exam_score'].to_numpy()
+    bins = np.asarray(SCORE_CATEGORY_BINS, dtype=scores.dtype)
+    codes = np.searchsorted(bins, scores, side='left') - 1
+    codes[(scores <= bins[0]) | (scores > bins[-1]) | np.isnan(scores)] = -1
+    df['score_category'] = pd.Categorical.from_codes(codes, categories=SCORE_CATEGORY_LABELS, ordered=True)
+
+def _prepare_filters(df: pd.DataFrame) -> None:
+    """Przygotowuje (raz dla danego DataFrame) tablice NumPy i kategorie kolumn filtrujących."""
+    global _filter_source, _filter_arrays, _category_masks, _hours_sorted, _kpi_values, _kpi_positions, \
+        _filter_categories, _filter_domains
+
+    if _filter_source is not df:
+        _filter_arrays = {col: df[col].cat.codes.to_numpy() for col in CATEGORICAL_COLUMNS}
+        _filter_arrays['study_hours_per_day'] = df['study_hours_per_day'].to_numpy()
+        # Jedna maska na kategorię (wiersz k: codes == k) – filtr to wtedy tylko OR wybranych wierszy
+        _category_masks = {
+            col: _filter_arrays[col] == np.arange(len(df[col].cat.categories))[:, np.newaxis]
+            for col in CATEGORICAL_COLUMNS
+        }
+        # Posortowane godziny nauki (bez braków) pozwalają wyznaczyć zakres przez np.searchsorted
+        study_hours = _filter_arrays['study_hours_per_day']
+        _hours_sorted = bool(np.all(study_hours[1:] >= study_hours[:-1]))
+        # Wynik i godziny nauki jako dwa wiersze jednej macierzy float64, w kolejności wierszy z pliku CSV;
+        # _kpi_positions[i] to pozycja wiersza i DataFrame w tej macierzy
+        source_order = np.argsort(df.index.to_numpy(), kind='stable')
+        _kpi_values = np.vstack([
+            df['exam_score'].to_numpy(dtype=np.float64)[source_order],
+            df['study_hours_per_day'].to_numpy(dtype=np.float64)[source_order]
+        ])
+        _kpi_positions = np.empty(len(df), dtype=np.intp)
+        _kpi_positions[source_order] = np.arange(len(df))
+        _filter_categories = {col: df[col].cat.categories for col in CATEGORICAL_COLUMNS}
+        # Zakres suwaka z pominięciem braków, jak Series.min()/max(); bez żadnej wartości – suwak 0-0
+        known_hours = study_hours[~np.isnan(study_hours)]
+        _filter_domains = FilterDomains(
+            gender=tuple(_filter_categories['gender']),
+            edu=tuple(_filter_categories['parental_education_level']),
+            job=tuple(_filter_categories['part_time_job']),
+            min_hours=int(known_hours.min()) if len(known_hours) else 0,
+            max_hours=int(known_hours.max()) if len(known_hours) else 0
+        )
+        _filter_source = df
+        # Zapamiętane wyniki dotyczą poprzedniego DataFrame
+        _filter_indices.cache_clear()
+
+def get_filter_domains(df: pd.DataFrame) -> FilterDomains:
+    """Zwraca opcje filtrów i zakres godzin nauki, wyliczane raz dla danego DataFrame."""
+    _prepare_filters(df)
+    return _filter_domains
 
-    # Stworzenie kopii DataFrame, aby uniknąć modyfikacji oryginalnych danych
-    filtered_df = df.copy()
+def _category_mask(col: str, selected: Tuple[str, ...], rows: slice) -> np.ndarray:
+    """Zwraca maskę wierszy z zakresu rows, których kategoria w kolumnie należy do wybranych etykiet."""
+    # Tłumaczenie etykiet na kody; nieznane etykiety (-1) pomijamy, bo -1 oznacza brak wartości
+    selected_codes = _filter_categories[col].get_indexer(list(selected))
+    selected_codes = selected_codes[selected_codes >= 0]
+    if len(selected_codes) == 0:
+        return np.zeros(rows.stop - rows.start, dtype=bool)
+    # Suma logiczna gotowych masek wybranych kategorii (bez tablicy haszującej jak w np.isin)
+    return np.logical_or.reduce(_category_masks[col][selected_codes, rows], axis=0)
+
+@lru_cache(maxsize=128)
+def _filter_indices(gender_key: Tuple[str, ...], edu_key: Tuple[str, ...],
+                    hours_key: Tuple[float, ...], job_key: Tuple[str, ...]) -> np.ndarray:
+    """Wyznacza numery wierszy bieżącego DataFrame spełniających filtry (wynik zapamiętywany)."""
+    study_hours = _filter_arrays['study_hours_per_day']
+    start, stop = 0, len(study_hours)
+
+    # Filtr zakresu godzin nauki – na posortowanych danych to ciągły przedział wierszy [start, stop)
+    if len(hours_key) == 2 and _hours_sorted:
+        start = int(np.searchsorted(study_hours, hours_key[0], side='left'))
+        stop = max(start, int(np.searchsorted(study_hours, hours_key[1], side='right')))
+    rows = slice(start, stop)
+
+    # Jedna wspólna maska logiczna (tylko dla wierszy z zakresu) zamiast kopii i pośrednich DataFrame'ów
+    mask = np.ones(stop - start, dtype=bool)
 
     # Filtr płci
-    if selected_gender:
-        filtered_df = filtered_df[filtered_df['gender'].isin(selected_gender)]
+    if gender_key:
+        mask &= _category_mask('gender', gender_key, rows)
 
     # Filtr wykształcenia rodziców
-    if selected_edu:
-        filtered_df = filtered_df[filtered_df['parental_education_level'].isin(selected_edu)]
+    if edu_key:
+        mask &= _category_mask('parental_education_level', edu_key, rows)
 
     # Filtr pracy na część etatu
-    if selected_job:
-        filtered_df = filtered_df[filtered_df['part_time_job'].isin(selected_job)]
+    if job_key:
+        mask &= _category_mask('part_time_job', job_key, rows)
+
+    # Dane nieposortowane (np. z brakami w godzinach nauki) – zwykłe porównanie na całej kolumnie
+    if len(hours_key) == 2 and not _hours_sorted:
+        mask &= (study_hours >= hours_key[0]) & (study_hours <= hours_key[1])
+
+    # Indeksy są współdzielone przez pamięć podręczną, więc blokujemy ich modyfikację
+    indices = start + np.flatnonzero(mask)
+    indices.flags.writeable = False
+    return indices
+
+def make_filter_key(selected_gender: Optional[List[str]], selected_edu: Optional[List[str]],
+                    study_hours_range: Optional[List[int]], selected_job: Optional[List[str]]) -> FilterKey:
+    """Normalizuje wybory użytkownika do hashowalnego klucza (kolejność i None bez znaczenia)."""
+    return (
+        tuple(sorted(selected_gender or ())),
+        tuple(sorted(selected_edu or ())),
+        tuple(study_hours_range or ()),
+        tuple(sorted(selected_job or ()))
+    )
+
+def filter_indices(df: pd.DataFrame, selected_gender: Optional[List[str]],
+                   selected_edu: Optional[List[str]], study_hours_range: List[int],
+                   selected_job: Optional[List[str]]) -> np.ndarray:
+    """Zwraca numery wierszy DataFrame spełniających wybory użytkownika."""
+    # Sprawdzenie, czy DataFrame został załadowany
+    if df is None or df.empty:
+        return np.empty(0, dtype=np.intp)
+
+    _prepare_filters(df)
+
+    # Normalizacja wyborów do postaci hashowalnej, aby powtarzające się stany filtrów trafiały w cache
+    return _filter_indices(*make_filter_key(selected_gender, selected_edu, study_hours_range, selected_job))
+
+def _nan_mean(values: np.ndarray) -> float:
+    """Średnia jednowymiarowej tablicy z pominięciem braków (NaN), liczona tak jak Series.mean() w pandas."""
+    # Suma po ciągłej tablicy 1D (sumowanie parami jak w pandas) – inna kolejność dodawania zmieniałaby
+    # ostatni bit wyniku, a przez to zaokrąglenie wyświetlanych KPI (np. 0.475 -> 0.48 zamiast 0.47)
+    valid = ~np.isnan(values)
+    count = int(valid.sum())
+    if count == 0:
+        return float('nan')
+    return float(np.where(valid, values, 0.0).sum() / count)
+
+def compute_kpis(df: pd.DataFrame, indices: np.ndarray) -> Tuple[str, str, str]:
+    """Zwraca sformatowane KPI (liczba studentów, średni wynik, średnie godziny nauki) dla wskazanych wierszy."""
+    if df is None or len(indices) == 0:
+        return "0", "N/A", "N/A"
 
-    # Filtr zakresu godzin nauki
-    if len(study_hours_range) == 2:
-        filtered_df = filtered_df[
-            (filtered_df['study_hours_per_day'] >= study_hours_range[0]) &
-            (filtered_df['study_hours_per_day'] <= study_hours_range[1])
-        ]
+    # KPI liczone bezpośrednio na tablicach NumPy, bez budowania przefiltrowanego DataFrame
+    _prepare_filters(df)
+    # Wiersze w kolejności z pliku CSV, aby średnie były sumowane w tej samej kolejności co w pandas
+    avg_score, avg_study_hours = (_nan_mean(row) for row in _kpi_values[:, np.sort(_kpi_positions[indices])])
 
-    return filtered_df
+    return str(len(indices)), f"{avg_score:.2f}", f"{avg_study_hours:.2f}"
@@ -0,0 +1,18 @@
+import os
+
+# Konfiguracja serwera produkcyjnego – gunicorn wczytuje ten plik automatycznie przy uruchomieniu
+# z katalogu projektu (`gunicorn` lub `gunicorn app:server`). Adres i port: --bind lub zmienna PORT.
+
+# Aplikacja WSGI (serwer Flask aplikacji Dash)
+wsgi_app = "app:server"
+
+# Kilka procesów z pulą wątków: callbacki z różnych kart/użytkowników są obsługiwane równolegle.
+# Wątki (gthread) zamiast gevent – budowanie wykresów obciąża CPU, a plots.py korzysta z własnej puli wątków.
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Każdy proces ładuje dane sam – pula wątków wykresów utworzona przed fork() nie działałaby w procesach potomnych
+preload_app = False
+
+timeout = 60
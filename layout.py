@@ -1,31 +1,45 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
 from dash import dcc, html
 import pandas as pd
+import plotly.io as pio
 import dash_bootstrap_components as dbc
 
+import data_manager
+import plots
+from config import PLOT_TEMPLATES, FIGURE_IDS
+
+
+@lru_cache(maxsize=16)
+def _build_options(values: Tuple[str, ...]) -> List[Dict[str, str]]:
+    """Buduje (raz dla danego zestawu wartości) listę opcji dropdowna."""
+    return [{'label': str(value), 'value': str(value)} for value in values]
+
+@lru_cache(maxsize=16)
+def _build_marks(min_hours: int, max_hours: int) -> Dict[int, str]:
+    """Buduje (raz dla danego zakresu) etykiety suwaka godzin nauki."""
+    return {i: str(i) for i in range(min_hours, max_hours + 1)}
+
 
 def create_layout(df: pd.DataFrame) -> html.Div:
     """Tworzy layout aplikacji na podstawie załadowanego DataFrame."""
 
-    # Przygotowanie opcji dla filtrów
-    gender_options = [
-        {'label': str(gender), 'value': str(gender)}
-        for gender in sorted(df['gender'].dropna().unique())
-    ]
+    # Opcje filtrów i zakres suwaka wyznaczane są raz przy ładowaniu danych
+    domains = data_manager.get_filter_domains(df)
 
-    edu_options = [
-        {'label': str(edu), 'value': str(edu)}
-        for edu in sorted(df['parental_education_level'].dropna().unique())
-    ]
+    gender_options = _build_options(domains.gender)
+    edu_options = _build_options(domains.edu)
+    job_options = _build_options(domains.job)
 
-    # Dodanie opcji dla filtra pracy
-    job_options = [
-        {'label': str(job), 'value': str(job)}
-        for job in sorted(df['part_time_job'].dropna().unique())
-    ]
+    min_hours = domains.min_hours
+    max_hours = domains.max_hours
 
-    # Określenie zakresu dla suwaka godzin nauki
-    min_hours = int(df['study_hours_per_day'].min())
-    max_hours = int(df['study_hours_per_day'].max())
+    # Wykresy i KPI dla stanu początkowego (bez filtrów) renderowane od razu w layoucie,
+    # zamiast wywoływać główny callback przy starcie aplikacji
+    initial_indices = data_manager.filter_indices(df, None, None, [min_hours, max_hours], None)
+    initial_df = df.take(initial_indices)
+    student_count, avg_score, avg_study_hours = data_manager.compute_kpis(df, initial_indices)
+    figures = dict(zip(FIGURE_IDS, plots.create_all_figures(initial_df, PLOT_TEMPLATES["Jasny"])))
 
     return html.Div(id="themed-layout", children=[
         # Nagłówek i przełącznik motywu
@@ -38,6 +52,10 @@ def create_layout(df: pd.DataFrame) -> html.Div:
             ),
         ], style={"marginBottom": "20px"}),
         dcc.Store(id='theme-store', data="Jasny"),  # Przechowuje wybrany motyw
+        # Szablony wykresów dla motywów – zmiana motywu podmienia je w przeglądarce
+        dcc.Store(id='plot-templates', data={
+            theme: pio.templates[template].to_plotly_json() for theme, template in PLOT_TEMPLATES.items()
+        }),
 
         html.H1("📊 Nawyki studentów a wyniki w nauce", style={"textAlign": "center"}),
 
@@ -45,9 +63,9 @@ def create_layout(df: pd.DataFrame) -> html.Div:
         html.Div([
             html.H3("Kluczowe wskaźniki", style={"textAlign": "center"}),
             html.Div([
-                dbc.Col([html.H4("Liczba studentów"), html.H2(id="kpi-student-count")]),
-                dbc.Col([html.H4("Średni wynik"), html.H2(id="kpi-avg-score")]),
-                dbc.Col([html.H4("Śr. godziny nauki"), html.H2(id="kpi-avg-study-hours")]),
+                dbc.Col([html.H4("Liczba studentów"), html.H2(student_count, id="kpi-student-count")]),
+                dbc.Col([html.H4("Średni wynik"), html.H2(avg_score, id="kpi-avg-score")]),
+                dbc.Col([html.H4("Śr. godziny nauki"), html.H2(avg_study_hours, id="kpi-avg-study-hours")]),
             ], className="row text-center my-4")
         ]),
 
@@ -70,30 +88,36 @@ def create_layout(df: pd.DataFrame) -> html.Div:
             html.Label("Zakres godzin nauki (na dzień):"),
             dcc.RangeSlider(
                 id="study-hours-slider", min=min_hours, max=max_hours, step=1,
-                marks={i: str(i) for i in range(min_hours, max_hours + 1)},
-                value=[min_hours, max_hours]
+                marks=_build_marks(min_hours, max_hours),
+                value=[min_hours, max_hours],
+                updatemode='mouseup'  # Wartość aktualizowana dopiero po puszczeniu suwaka
             )
         ], style={"marginBottom": "30px"}),
 
+        # Zbiorczy stan filtrów, aktualizowany z opóźnieniem po ostatniej zmianie (debounce)
+        dcc.Store(id='filter-state', data={
+            'gender': None, 'edu': None, 'study_hours': [min_hours, max_hours], 'job': None
+        }),
+
         # Sekcja z wykresami
         dbc.Row([
-            dbc.Col(dcc.Graph(id="scatter-plot"), width=6),
-            dbc.Col(dcc.Graph(id="box-plot"), width=6)
+            dbc.Col(dcc.Graph(id="scatter-plot", figure=figures["scatter-plot"]), width=6),
+            dbc.Col(dcc.Graph(id="box-plot", figure=figures["box-plot"]), width=6)
         ], className="mb-4"),
         dbc.Row([
-            dbc.Col(dcc.Graph(id="heatmap"), width=6),
-            dbc.Col(dcc.Graph(id="histogram_fig"), width=6)
+            dbc.Col(dcc.Graph(id="heatmap", figure=figures["heatmap"]), width=6),
+            dbc.Col(dcc.Graph(id="histogram_fig", figure=figures["histogram_fig"]), width=6)
         ], className="mb-4"),
         dbc.Row([
-            dbc.Col(dcc.Graph(id="barchart_fig"), width=6),
-            dbc.Col(dcc.Graph(id="line_fig"), width=6)
+            dbc.Col(dcc.Graph(id="barchart_fig", figure=figures["barchart_fig"]), width=6),
+            dbc.Col(dcc.Graph(id="line_fig", figure=figures["line_fig"]), width=6)
         ], className="mb-4"),
         dbc.Row([
-            dbc.Col(dcc.Graph(id="attendance-violin-plot"), width=6),
-            dbc.Col(dcc.Graph(id="job-sunburst"), width=6)
+            dbc.Col(dcc.Graph(id="attendance-violin-plot", figure=figures["attendance-violin-plot"]), width=6),
+            dbc.Col(dcc.Graph(id="job-sunburst", figure=figures["job-sunburst"]), width=6)
         ], className="mb-4"),
         dbc.Row([
-            dbc.Col(dcc.Graph(id="mental-health-polar"), width=12)
+            dbc.Col(dcc.Graph(id="mental-health-polar", figure=figures["mental-health-polar"]), width=12)
         ], className="mb-4"),
     ])
 
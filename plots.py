@@ -1,10 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.graph_objs import Figure
 
-from config import HEATMAP_NUMERIC_COLS
-
+from config import HEATMAP_NUMERIC_COLS, SCATTER_MAX_POINTS
+
+# Granice przedziałów histogramu wyników egzaminu (20 przedziałów po 5 punktów)
+_HISTOGRAM_EDGES = np.linspace(0, 100, 21)
+# Zakresy przedziałów pokazywane po najechaniu myszką, jak w px.histogram (np. 55-59.9): wyniki mają jedno
+# miejsce po przecinku, a przedziały są prawostronnie otwarte – z wyjątkiem ostatniego, domkniętego w np.histogram
+_HISTOGRAM_BIN_RANGES = np.column_stack([
+    _HISTOGRAM_EDGES[:-1],
+    np.round(np.append(_HISTOGRAM_EDGES[1:-1] - 0.1, _HISTOGRAM_EDGES[-1]), 1)
+])
+
+
+def _grouped_mean(keys: np.ndarray, values: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Zwraca średnie wartości dla grup 0..n_groups-1 oraz maskę grup, które wystąpiły w danych."""
+    # Braki w wartościach pomijane, jak w groupby().mean()
+    valid = np.isfinite(values)
+    keys, values = keys[valid], values[valid]
+    counts = np.bincount(keys, minlength=n_groups)
+    sums = np.bincount(keys, weights=values, minlength=n_groups)
+    observed = counts > 0
+    means = np.divide(sums, counts, out=np.zeros(n_groups), where=observed)
+    return means, observed
 
 def create_scatter_plot(filtered_df: pd.DataFrame, template: str) -> Figure:
     """Tworzy wykres rozrzutu pokazujący zależność między godzinami nauki a wynikiem egzaminu."""
@@ -12,44 +35,85 @@ def create_scatter_plot(filtered_df: pd.DataFrame, template: str) -> Figure:
     if filtered_df.empty:
         return px.scatter(title="Wpływ czasu nauki na wynik egzaminu (Brak danych)")
 
-    # Tworzenie wykresu rozrzutu
-    return px.scatter(
-        filtered_df,
-        x="study_hours_per_day",
-        y="exam_score",
-        color="gender",
-        hover_data=['social_media_hours', 'sleep_hours'],  # Dodatkowe informacje po najechaniu myszką
+    # Przy bardzo dużej liczbie wierszy wybieramy co k-ty – dane są posortowane wg godzin nauki,
+    # więc próbka równomiernie pokrywa całą oś X (i zachowuje proporcje płci)
+    if len(filtered_df) > SCATTER_MAX_POINTS:
+        sample = np.linspace(0, len(filtered_df) - 1, SCATTER_MAX_POINTS).astype(np.intp)
+        filtered_df = filtered_df.take(sample)
+
+    # Ślady Scattergl (rysowane przez WebGL) budowane bezpośrednio z tablic NumPy – jeden na każdą płeć
+    gender = filtered_df["gender"]
+    codes = gender.cat.codes.to_numpy()
+    study_hours = filtered_df["study_hours_per_day"].to_numpy()
+    exam_score = filtered_df["exam_score"].to_numpy()
+    # Dodatkowe informacje po najechaniu myszką (float32 – w etykiecie formatowane do 6 cyfr znaczących,
+    # aby 1.2 nie było pokazywane jako 1.2000000476837158)
+    hover_values = filtered_df[["social_media_hours", "sleep_hours"]].to_numpy()
+
+    fig = go.Figure()
+    for code, label in enumerate(gender.cat.categories):
+        in_group = codes == code
+        if not in_group.any():
+            continue
+        fig.add_trace(go.Scattergl(
+            x=study_hours[in_group],
+            y=exam_score[in_group],
+            customdata=hover_values[in_group],
+            mode="markers",
+            name=label,
+            legendgroup=label,
+            showlegend=True,
+            hovertemplate=(
+                f"Płeć={label}<br>Godziny nauki dziennie=%{{x}}<br>Wynik egzaminu=%{{y}}"
+                "<br>Social media hours=%{customdata[0]:.6~g}<br>Godziny snu=%{customdata[1]:.6~g}<extra></extra>"
+            )
+        ))
+
+    fig.update_layout(
         template=template,
         title="Wpływ czasu nauki na wynik egzaminu",
-        labels={
-            'gender': 'Płeć',
-            'study_hours_per_day': 'Godziny nauki dziennie',
-            'exam_score': 'Wynik egzaminu',
-            'social_media_hours': 'Social media hours',
-            'sleep_hours': 'Godziny snu'
-        }
+        xaxis_title="Godziny nauki dziennie",
+        yaxis_title="Wynik egzaminu",
+        legend=dict(title_text="Płeć", tracegroupgap=0)
     )
 
+    return fig
+
 def create_box_plot(filtered_df: pd.DataFrame, template: str) -> Figure:
     """Tworzy wykres pudełkowy dla wyników egzaminu w podziale na płeć."""
     # Jeśli przefiltrowane dane są puste, zwróć pusty wykres z informacją
     if filtered_df.empty:
         return px.box(title="Rozkład wyników egzaminu względem płci (Brak danych)")
 
-    # Tworzenie wykresu pudełkowego
-    return px.box(
-        filtered_df,
-        x="gender",
-        y="exam_score",
-        color="gender",
+    # Jeden ślad go.Box na każdą płeć; bez tablicy x – nazwa śladu wyznacza jego pozycję na osi kategorii
+    gender = filtered_df["gender"]
+    codes = gender.cat.codes.to_numpy()
+    exam_score = filtered_df["exam_score"].to_numpy()
+
+    fig = go.Figure()
+    for code, label in enumerate(gender.cat.categories):
+        in_group = codes == code
+        if not in_group.any():
+            continue
+        fig.add_trace(go.Box(
+            y=exam_score[in_group],
+            name=label,
+            legendgroup=label,
+            showlegend=True,
+            hovertemplate="Płeć=%{x}<br>Wynik egzaminu=%{y}<extra></extra>"
+        ))
+
+    fig.update_layout(
         template=template,
         title="Rozkład wyników egzaminu względem płci",
-        labels={
-            'gender': 'Płeć',
-            'exam_score': 'Wynik egzaminu'
-        }
+        xaxis_title="Płeć",
+        yaxis_title="Wynik egzaminu",
+        legend=dict(title_text="Płeć", tracegroupgap=0),
+        boxmode="overlay"
     )
 
+    return fig
+
 def create_heatmap(filtered_df: pd.DataFrame, template: str) -> Figure:
     """Tworzy mapę ciepła korelacji."""
     # Jeśli przefiltrowane dane są puste, zwróć pusty wykres z informacją
@@ -63,115 +127,184 @@ def create_heatmap(filtered_df: pd.DataFrame, template: str) -> Figure:
     if len(available_columns) < 2:
         return px.imshow([[0]], title="Korelacje między cechami (Niewystarczające dane)")
 
-    # Obliczenie macierzy korelacji
-    heatmap_df = filtered_df[available_columns].corr()
+    # Obliczenie macierzy korelacji jednym wywołaniem np.corrcoef na ciągłej macierzy float32
+    # (wiersze z brakami usuwane raz; korelacja wymaga co najmniej dwóch obserwacji)
+    values = filtered_df[available_columns].to_numpy(dtype=np.float32)
+    values = values[~np.isnan(values).any(axis=1)]
+    if len(values) < 2:
+        return px.imshow([[0]], title="Korelacje między cechami (Niewystarczające dane)")
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = np.corrcoef(values, rowvar=False)
+    # Na przekątnej dokładnie 1 (np.corrcoef daje tam 0.999… przez zaokrąglenia), NaN dla stałych kolumn
+    np.fill_diagonal(corr, np.where(np.isnan(np.diag(corr)), np.nan, 1.0))
+    # Dwa miejsca po przecinku wystarczą do prezentacji; float32 o połowę zmniejsza zakodowaną macierz
+    corr = np.round(corr, 2).astype(np.float32)
+
     # Tworzenie mapy ciepła
-    return px.imshow(
-        heatmap_df,
-        text_auto=True,  # Automatyczne wyświetlanie wartości korelacji na mapie
+    fig = go.Figure(go.Heatmap(
+        z=corr,
+        x=available_columns,
+        y=available_columns,
+        coloraxis="coloraxis",
+        texttemplate="%{z:.2f}",  # Wyświetlanie wartości korelacji na mapie
+        hovertemplate="x: %{x}<br>y: %{y}<br>color: %{z:.2f}<extra></extra>"
+    ))
+
+    fig.update_layout(
         template=template,
         title="Korelacje między cechami",
-        aspect="auto",  # Automatyczne dopasowanie proporcji
+        coloraxis_colorscale="Plasma",  # Skala sekwencyjna jak w px.imshow (bez niej plotly.js wybrałby skalę rozbieżną)
+        yaxis_autorange="reversed"  # Pierwsza kolumna na górze, jak w macierzy
     )
 
+    return fig
+
 def create_exam_score_histogram(filtered_df: pd.DataFrame, template: str) -> Figure:
     """Tworzy histogram rozkładu wyników egzaminu z podziałem na płeć."""
     if filtered_df.empty:
-        return px.histogram(title="Rozkład wyników egzaminu (Brak danych)")
+        # px.histogram bez danych zgłasza wyjątek – pusty go.Figure z samym tytułem
+        return go.Figure(layout=dict(title="Rozkład wyników egzaminu (Brak danych)", template=template))
+
+    # Przedziały liczone na serwerze (np.histogram) – do przeglądarki trafiają tylko liczności słupków,
+    # a nie wszystkie surowe wyniki
+    gender = filtered_df["gender"]
+    codes = gender.cat.codes.to_numpy()
+    scores = filtered_df["exam_score"].to_numpy()
+    centers = (_HISTOGRAM_EDGES[:-1] + _HISTOGRAM_EDGES[1:]) / 2
 
-    return px.histogram(
-        filtered_df,
-        x="exam_score",
-        color="gender",
-        nbins=20,
+    fig = go.Figure()
+    for code, label in enumerate(gender.cat.categories):
+        in_group = codes == code
+        if not in_group.any():
+            continue
+        counts, _ = np.histogram(scores[in_group], bins=_HISTOGRAM_EDGES)
+        fig.add_trace(go.Bar(
+            x=centers,
+            y=counts,
+            width=np.diff(_HISTOGRAM_EDGES),
+            customdata=_HISTOGRAM_BIN_RANGES,
+            name=label,
+            opacity=0.6,
+            hovertemplate=(
+                f"Płeć={label}<br>Wynik egzaminu=%{{customdata[0]}}-%{{customdata[1]}}<br>count=%{{y}}<extra></extra>"
+            )
+        ))
+
+    fig.update_layout(
         barmode='overlay',
-        opacity=0.6,
         template=template,
         title="Rozkład wyników egzaminu wg płci",
-        labels={
-            "exam_score": "Wynik egzaminu",
-            "gender": "Płeć"
-        }
+        xaxis_title="Wynik egzaminu",
+        yaxis_title="count",
+        legend_title_text="Płeć"
     )
 
+    return fig
+
 def create_bar_avg_score_by_edu(filtered_df: pd.DataFrame, template: str) -> Figure:
     """Tworzy wykres słupkowy średnich wyników wg wykształcenia rodziców."""
     if filtered_df.empty:
         return px.bar(title="Średnie wyniki wg poziomu edukacji rodziców (Brak danych)")
 
-    avg_scores = (
-        filtered_df
-        .groupby("parental_education_level")["exam_score"]
-        .mean()
-        .sort_values()
-        .reset_index()
-    )
+    # Średnie w grupach przez np.bincount na kodach kategorii (-1 to brak wartości – pomijany)
+    edu = filtered_df["parental_education_level"]
+    codes = edu.cat.codes.to_numpy()
+    present = codes >= 0
+    means, observed = _grouped_mean(codes[present], filtered_df["exam_score"].to_numpy()[present],
+                                    len(edu.cat.categories))
+
+    # Słupki posortowane rosnąco wg średniego wyniku
+    order = np.argsort(means[observed], kind="stable")
 
-    return px.bar(
-        avg_scores,
-        x="parental_education_level",
-        y="exam_score",
+    fig = go.Figure(go.Bar(
+        x=edu.cat.categories[observed][order],
+        y=means[observed][order],
+        hovertemplate="Poziom wykształcenia rodziców=%{x}<br>Średni wynik egzaminu=%{y}<extra></extra>"
+    ))
+
+    fig.update_layout(
         template=template,
         title="Średnie wyniki egzaminów wg wykształcenia rodziców",
-        labels={
-            "parental_education_level": "Poziom wykształcenia rodziców",
-            "exam_score": "Średni wynik egzaminu"
-        }
+        xaxis_title="Poziom wykształcenia rodziców",
+        yaxis_title="Średni wynik egzaminu"
     )
 
+    return fig
+
 def create_sleep_vs_score_lineplot(filtered_df: pd.DataFrame, template: str) -> Figure:
     """Tworzy wykres liniowy: średni wynik egzaminu w zależności od liczby godzin snu."""
     if filtered_df.empty:
         return px.line(title="Średni wynik vs liczba godzin snu (Brak danych)")
 
-    df_grouped = (
-        filtered_df
-        .copy()
-        .assign(sleep_hours_rounded=lambda df: df['sleep_hours'].round())
-        .groupby("sleep_hours_rounded")["exam_score"]
-        .mean()
-        .reset_index()
-    )
+    # Średnie w grupach przez np.bincount na zaokrąglonych godzinach snu (przesuniętych do zera);
+    # wiersze bez godzin snu są pomijane, jak w groupby
+    sleep_hours = filtered_df['sleep_hours'].to_numpy()
+    has_sleep = np.isfinite(sleep_hours)
+    if not has_sleep.any():
+        return px.line(title="Średni wynik vs liczba godzin snu (Brak danych)")
+    sleep_rounded = np.rint(sleep_hours[has_sleep]).astype(np.int64)
+    offset = sleep_rounded.min()
+    means, observed = _grouped_mean(sleep_rounded - offset, filtered_df['exam_score'].to_numpy()[has_sleep],
+                                    sleep_rounded.max() - offset + 1)
+
+    fig = go.Figure(go.Scatter(
+        x=(np.flatnonzero(observed) + offset).astype(np.float64),
+        y=means[observed],
+        mode="lines+markers",
+        hovertemplate="Godziny snu (zaokrąglone)=%{x}<br>Średni wynik egzaminu=%{y}<extra></extra>"
+    ))
 
-    return px.line(
-        df_grouped,
-        x="sleep_hours_rounded",
-        y="exam_score",
-        markers=True,
+    fig.update_layout(
         template=template,
         title="Średni wynik egzaminu w zależności od liczby godzin snu",
-        labels={
-            "sleep_hours_rounded": "Godziny snu (zaokrąglone)",
-            "exam_score": "Średni wynik egzaminu"
-        }
+        xaxis_title="Godziny snu (zaokrąglone)",
+        yaxis_title="Średni wynik egzaminu"
     )
 
+    return fig
+
 def create_attendance_violin_plot(filtered_df: pd.DataFrame, template: str) -> Figure:
     """Tworzy wykres skrzypcowy pokazujący rozkład frekwencji dla różnych przedziałów wyników."""
     if filtered_df.empty:
         return px.violin(title="Rozkład frekwencji wg wyników egzaminu (Brak danych)")
 
-    # Tworzenie kategorii wyników
-    filtered_df = filtered_df.copy()
-    filtered_df['score_category'] = pd.cut(
-        filtered_df['exam_score'],
-        bins=[0, 60, 75, 85, 100],
-        labels=['Słaby (0-60)', 'Średni (60-75)', 'Dobry (75-85)', 'Bardzo dobry (85-100)']
-    )
+    # Kategorie wyników są wyliczane raz przy ładowaniu danych (kolumna 'score_category');
+    # jeden ślad go.Violin na kategorię, bez tablicy x – nazwa śladu wyznacza pozycję na osi
+    score_category = filtered_df['score_category']
+    codes = score_category.cat.codes.to_numpy()
+    attendance = filtered_df['attendance_percentage'].to_numpy()
+
+    fig = go.Figure()
+    for code, label in enumerate(score_category.cat.categories):
+        in_group = codes == code
+        if not in_group.any():
+            continue
+        fig.add_trace(go.Violin(
+            y=attendance[in_group],
+            name=label,
+            legendgroup=label,
+            scalegroup="True",
+            showlegend=True,
+            # Frekwencja jest float32 – bez formatu statystyki wyświetlałyby się np. jako 85.0999984741211
+            hovertemplate="Kategoria wyniku egzaminu=%{x}<br>Procentowa frekwencja na zajęciach=%{y:.6~g}<extra></extra>"
+        ))
 
-    return px.violin(
-        filtered_df.dropna(subset=['score_category']),
-        x="score_category",
-        y="attendance_percentage",
-        color="score_category",
+    fig.update_layout(
         template=template,
         title="Rozkład frekwencji w różnych kategoriach wyników",
-        labels={
-            'score_category': 'Kategoria wyniku egzaminu',
-            'attendance_percentage': 'Procentowa frekwencja na zajęciach'
-        }
+        xaxis=dict(
+            title_text="Kategoria wyniku egzaminu",
+            categoryorder="array",
+            categoryarray=list(score_category.cat.categories)
+        ),
+        yaxis_title="Procentowa frekwencja na zajęciach",
+        legend=dict(title_text="Kategoria wyniku egzaminu", tracegroupgap=0),
+        violinmode="overlay"
     )
 
+    return fig
+
 def create_job_sunburst_chart(filtered_df: pd.DataFrame, template: str) -> Figure:
     # """Tworzy wykres słoneczny: struktura studentów wg pracy i płci."""
     # if filtered_df.empty or 'part_time_job' not in filtered_df.columns:
@@ -194,34 +327,39 @@ def create_job_sunburst_chart(filtered_df: pd.DataFrame, template: str) -> Figur
 
     # Przygotowanie danych dla sunburst
     job_gender_counts = (
-        filtered_df.groupby(['part_time_job', 'gender'])
+        filtered_df.groupby(['part_time_job', 'gender'], observed=True)
         .size()
         .reset_index(name='count')
     )
 
-    # Tworzenie struktury hierarchicznej
-    sunburst_data = []
-
-    # Dodanie poziomów: praca -> płeć
-    for _, row in job_gender_counts.iterrows():
-        sunburst_data.append({
-            'ids': f"{row['part_time_job']} - {row['gender']}",
-            'labels': f"{row['gender']}",
-            'parents': f"{row['part_time_job']}",
-            'values': row['count']
-        })
-
-    # Dodanie głównych kategorii pracy
-    job_totals = filtered_df.groupby('part_time_job').size().reset_index(name='total')
-    for _, row in job_totals.iterrows():
-        sunburst_data.append({
-            'ids': f"{row['part_time_job']}",
-            'labels': f"Praca: {row['part_time_job']}",
-            'parents': "",
-            'values': row['total']
-        })
-
-    df_sunburst = pd.DataFrame(sunburst_data)
+    # Tworzenie struktury hierarchicznej (wektorowo, bez pętli po wierszach)
+    leaf_jobs = job_gender_counts['part_time_job'].astype(str)
+    leaf_genders = job_gender_counts['gender'].astype(str)
+
+    # Poziom liści: praca -> płeć
+    leaves = pd.DataFrame({
+        'ids': leaf_jobs + " - " + leaf_genders,
+        'labels': leaf_genders,
+        'parents': leaf_jobs,
+        'values': job_gender_counts['count']
+    })
+
+    # Główne kategorie pracy – sumy z policzonych już liści zamiast drugiego grupowania wszystkich wierszy
+    # (liście są już uporządkowane wg pracy, więc sort=False zachowuje tę samą kolejność)
+    job_totals = (
+        job_gender_counts.groupby('part_time_job', observed=True, sort=False)['count']
+        .sum()
+        .reset_index(name='total')
+    )
+    root_jobs = job_totals['part_time_job'].astype(str)
+    roots = pd.DataFrame({
+        'ids': root_jobs,
+        'labels': "Praca: " + root_jobs,
+        'parents': "",
+        'values': job_totals['total']
+    })
+
+    df_sunburst = pd.concat([leaves, roots], ignore_index=True)
 
     fig = go.Figure(go.Sunburst(
         ids=df_sunburst['ids'],
@@ -247,20 +385,35 @@ def create_mental_health_polar_chart(filtered_df: pd.DataFrame, template: str) -
             xref="paper", yref="paper", x=0.5, y=0.5, showarrow=False
         )
 
-    # Grupowanie po kondycji psychicznej i obliczanie średnich
-    mental_groups = filtered_df.groupby('mental_health_rating').agg({
-        'exam_score': 'mean',
-        'study_hours_per_day': 'mean',
-        'sleep_hours': 'mean',
-        'attendance_percentage': 'mean',
-        'social_media_hours': lambda x: 10 - x.mean()  # Odwrócona skala dla social media
-    }).reset_index()
-
-    # Normalizacja do skali 0-10 dla lepszej wizualizacji
-    mental_groups['exam_score_norm'] = mental_groups['exam_score'] / 10
-    mental_groups['study_hours_norm'] = mental_groups['study_hours_per_day'] * 2
-    mental_groups['sleep_hours_norm'] = mental_groups['sleep_hours'] * 1.25
-    mental_groups['attendance_norm'] = mental_groups['attendance_percentage'] / 10
+    # Średnie w grupach kondycji psychicznej przez np.bincount (oceny przesunięte do zera);
+    # wiersze bez oceny są pomijane, jak w groupby
+    ratings = filtered_df['mental_health_rating'].to_numpy()
+    rated = ~np.isnan(ratings)
+    if not rated.any():
+        return go.Figure().add_annotation(
+            text="Metryki wg kondycji psychicznej (Brak danych)",
+            xref="paper", yref="paper", x=0.5, y=0.5, showarrow=False
+        )
+    ratings = ratings[rated].astype(np.int64)
+    offset = ratings.min()
+    n_groups = ratings.max() - offset + 1
+    keys = ratings - offset
+
+    exam_mean, observed = _grouped_mean(keys, filtered_df['exam_score'].to_numpy()[rated], n_groups)
+    study_mean, _ = _grouped_mean(keys, filtered_df['study_hours_per_day'].to_numpy()[rated], n_groups)
+    sleep_mean, _ = _grouped_mean(keys, filtered_df['sleep_hours'].to_numpy()[rated], n_groups)
+    attendance_mean, _ = _grouped_mean(keys, filtered_df['attendance_percentage'].to_numpy()[rated], n_groups)
+    social_mean, _ = _grouped_mean(keys, filtered_df['social_media_hours'].to_numpy()[rated], n_groups)
+
+    # Normalizacja do skali 0-10 dla lepszej wizualizacji (wiersz = jedna ocena kondycji psychicznej)
+    profiles = np.column_stack([
+        exam_mean / 10,
+        study_mean * 2,
+        sleep_mean * 1.25,
+        attendance_mean / 10,
+        10 - social_mean  # Odwrócona skala dla social media
+    ])[observed]
+    group_ratings = np.flatnonzero(observed) + offset
 
     fig = go.Figure()
 
@@ -269,20 +422,14 @@ def create_mental_health_polar_chart(filtered_df: pd.DataFrame, template: str) -
     # Dodanie linii dla różnych poziomów kondycji psychicznej
     colors = ['red', 'orange', 'yellow', 'lightgreen', 'green', 'darkgreen', 'blue', 'purple', 'pink', 'brown']
 
-    for i, row in mental_groups.iterrows():
-        values = [
-            row['exam_score_norm'],
-            row['study_hours_norm'],
-            row['sleep_hours_norm'],
-            row['attendance_norm'],
-            row['social_media_hours']
-        ]
+    for i, (rating, profile) in enumerate(zip(group_ratings, profiles)):
+        values = profile.tolist()
 
         fig.add_trace(go.Scatterpolar(
             r=values + [values[0]],  # Zamknięcie wykresu
             theta=categories + [categories[0]],
             fill='toself',
-            name=f'Kondycja psychiczna: {int(row["mental_health_rating"])}',
+            name=f'Kondycja psychiczna: {int(rating)}',
             line_color=colors[i % len(colors)],
             opacity=0.6
         ))
@@ -300,3 +447,24 @@ def create_mental_health_polar_chart(filtered_df: pd.DataFrame, template: str) -
     )
 
     return fig
+
+# Funkcje tworzące wykresy, w kolejności odpowiadającej FIGURE_IDS
+FIGURE_BUILDERS = [
+    create_scatter_plot,
+    create_box_plot,
+    create_heatmap,
+    create_exam_score_histogram,
+    create_bar_avg_score_by_edu,
+    create_sleep_vs_score_lineplot,
+    create_attendance_violin_plot,
+    create_job_sunburst_chart,
+    create_mental_health_polar_chart
+]
+
+# Wspólna pula wątków – wykresy są od siebie niezależne, a funkcje je tworzące nie mają stanu
+_figure_executor = ThreadPoolExecutor(max_workers=len(FIGURE_BUILDERS), thread_name_prefix="plots")
+
+def create_all_figures(filtered_df: pd.DataFrame, template: str) -> Tuple[Figure, ...]:
+    """Tworzy równolegle wszystkie wykresy dashboardu w kolejności FIGURE_IDS."""
+    futures = [_figure_executor.submit(builder, filtered_df, template) for builder in FIGURE_BUILDERS]
+    return tuple(future.result() for future in futures)